@@ -0,0 +1,43 @@
+"""
+Micro-benchmark of the per-call overhead of `_deprecated`-wrapped methods and of `Version` comparisons.
+
+Run from the repository root:
+````text
+python benchmarks/bench_deprecated.py
+````
+"""
+import os
+import sys
+import warnings
+from timeit import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unda import UndaClient, UndaManager  # noqa: E402
+from unda.version import Version  # noqa: E402
+
+NUMBER = 20000
+
+
+class Target:
+
+    def __init__(self):
+        self.value = 0
+
+
+def report(label, statement):
+    seconds = timeit(statement, number=NUMBER)
+    print(f'{label:<28}{seconds / NUMBER * 1e6:8.2f} us/call')
+
+
+if __name__ == '__main__':
+    warnings.simplefilter('ignore')
+    manager = UndaManager()
+    client = UndaClient(Target())
+    low, high = Version('1.10.0'), Version('2.0.0')
+
+    report('UndaManager.add_client', lambda: manager.add_client('key', client))
+    report('UndaManager.add_object', lambda: manager.add_object('key', client))
+    report('Version.__lt__', lambda: low < high)
+    report('Version.__eq__', lambda: low == high)
+    report('hash(Version)', lambda: hash(low))
@@ -0,0 +1,157 @@
+import gc
+import threading
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from unda import SHARED, SharedStack, UndaClient
+
+
+class Reading:
+
+    def __init__(self):
+        self.x = 0.0
+        self.notes = []
+
+
+class Slotted:
+    __slots__ = ('a', 'b')
+
+    def __init__(self):
+        self.a = 1
+
+
+def _read_in_another_process(name, queue):
+    stack = SharedStack.attach(name)
+    try:
+        sequences = stack.sequences()
+        queue.put((sequences, stack.state(sequences[-1]), stack[0]))
+        try:
+            stack.append({})
+        except PermissionError:
+            queue.put('read-only')
+    finally:
+        stack.close()
+
+
+def test_reader_process_decodes_states():
+    target = Reading()
+    client = UndaClient(target, style=SHARED, stack_height=3)
+    try:
+        for step in range(1, 5):
+            target.x = float(step)
+            target.notes.append(step)
+            client.update()
+        context = get_context('spawn')
+        queue = context.Queue()
+        reader = context.Process(target=_read_in_another_process, args=(client.undo_stack.name, queue))
+        reader.start()
+        reader.join(30)
+        sequences, latest, oldest = queue.get(timeout=5)
+        assert sequences == [2, 3, 4]
+        assert latest == {'x': 4.0, 'notes': [1, 2, 3, 4]}
+        assert oldest == {'x': 2.0, 'notes': [1, 2]}
+        assert queue.get(timeout=5) == 'read-only'
+    finally:
+        client.close()
+
+
+def test_sequence_numbers_are_not_reused():
+    stack = SharedStack(maxlen=4, slot_size=256)
+    try:
+        stack.append({'x': 1})
+        stack.append({'x': 2})
+        stack.pop()
+        stack.append({'x': 3})
+        assert stack.sequences() == [0, 2]
+        with pytest.raises(IndexError):
+            stack.state(1)
+        assert stack.state(2) == {'x': 3}
+    finally:
+        stack.close()
+
+
+def test_reads_retry_while_a_write_is_in_progress():
+    stack = SharedStack(maxlen=2, slot_size=256)
+    reader = SharedStack.attach(stack.name)
+    try:
+        stack.append({'x': 1})
+        generation = stack._begin()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(reader.sequences()))
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive()
+        stack._commit(generation, 5, 0, 1)
+        thread.join(5)
+        assert results == [[0]]
+        assert reader.end == 5
+    finally:
+        reader.close()
+        stack.close()
+
+
+def test_close_destroys_the_block():
+    stack = SharedStack(maxlen=2, slot_size=256)
+    name = stack.name
+    stack.close()
+    stack.close()
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_garbage_collection_destroys_the_block():
+    client = UndaClient(Reading(), style=SHARED, stack_height=2)
+    name = client.undo_stack.name
+    del client
+    gc.collect()
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_unset_fields_stay_unset_after_undo():
+    target = Slotted()
+    client = UndaClient(target, style=SHARED, stack_height=3)
+    try:
+        target.b = 2
+        client.undo(inplace=True)
+        assert target.a == 1
+        assert not hasattr(target, 'b')
+    finally:
+        client.close()
+
+
+def test_history_decodes_shared_states():
+    target = Reading()
+    client = UndaClient(target, style=SHARED, stack_height=3)
+    try:
+        for step in range(1, 4):
+            target.x = float(step)
+            client.update()
+        assert client.history('x') == [1.0, 2.0, 3.0]
+        assert client.history('x', 2) == [2.0, 3.0]
+        assert client.history('missing', 1) == [None]
+    finally:
+        client.close()
+
+
+def test_history_needs_a_columnar_or_shared_style():
+    with pytest.raises(TypeError):
+        UndaClient(Reading()).history('x')
+
+
+def test_big_states_need_a_bigger_slot_size():
+    target = Reading()
+    target.notes = 'x' * 100000
+    client = UndaClient(target, style=SHARED, stack_height=2, auto_first_update=False)
+    try:
+        with pytest.raises(ValueError):
+            client.update()
+    finally:
+        client.close()
+    client = UndaClient(target, style=SHARED, undo_stack=SharedStack(maxlen=2, slot_size=2 ** 18))
+    try:
+        assert client.undo_stack[-1]['notes'] == target.notes
+    finally:
+        client.close()
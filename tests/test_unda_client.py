@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+
+import pytest
+
+from unda import UndaClient, COLUMNAR, SLOTS
+
+
+class Slotted:
+    __slots__ = ('x', 'y')
+
+    def __init__(self):
+        self.x = 1
+        self.y = [1]
+
+
+@dataclass(slots=True)
+class Point:
+    a: int = 0
+    b: str = 'q'
+
+
+def test_slots_style_is_chosen_for_slotted_targets():
+    assert UndaClient(Slotted()).style == SLOTS
+    assert UndaClient(Point()).style == SLOTS
+
+
+def test_slots_undo_redo_inplace():
+    point = Point()
+    client = UndaClient(point)
+    point.a = 3
+    client.update()
+    point.a, point.b = 4, 'z'
+    client.undo(inplace=True)
+    assert (point.a, point.b) == (3, 'q')
+    client.redo(inplace=True)
+    assert (point.a, point.b) == (4, 'z')
+
+
+def test_slots_records_inplace_changes_to_mutable_fields():
+    target = Slotted()
+    client = UndaClient(target)
+    target.y.append(2)
+    client.update()
+    target.y.append(3)
+    client.undo(inplace=True)
+    assert target.y == [1, 2]
+    target.y.append(4)
+    client.redo(inplace=True)
+    assert target.y == [1, 2, 3]
+
+
+class Body:
+
+    def __init__(self):
+        self.vx = 0
+        self.name = 'a'
+
+
+def test_columnar_restores_ints_and_floats_exactly():
+    body = Body()
+    client = UndaClient(body, style=COLUMNAR, stack_height=8)
+    body.vx = 0.5
+    client.update()
+    body.vx = 2
+    client.update()
+    body.vx = 2 ** 60 + 1
+    client.update()
+    body.vx = 1.5
+    client.update()
+    body.vx = 7
+    expected = [1.5, 2 ** 60 + 1, 2, 0.5, 0]
+    for value in expected:
+        client.undo(inplace=True)
+        assert body.vx == value
+        assert type(body.vx) is type(value)
+
+
+def test_columnar_history_of_mixed_numbers():
+    body = Body()
+    client = UndaClient(body, style=COLUMNAR, stack_height=4)
+    body.vx = 0.5
+    client.update()
+    assert list(client.history('vx')) == [0.0, 0.5]
+    body.vx = True
+    client.update()
+    assert client.history('vx') == [0, 0.5, True]
+    client.undo(inplace=True)
+    assert body.vx is True
+
+
+def test_columnar_types_attributes_added_after_the_first_state():
+    body = Body()
+    client = UndaClient(body, style=COLUMNAR, stack_height=4)
+    body.vy = 1.5
+    client.update()
+    assert client.undo_stack.row(0) == {'vx': 0, 'name': 'a'}
+    history = client.history('vy')
+    assert history[0] != history[0] and history[1] == 1.5
+    body.vy = 2.5
+    client.undo(inplace=True)
+    assert body.vy == 1.5
+    client.undo(inplace=True)
+    assert not hasattr(body, 'vy')
+
+
+def test_columnar_ring_buffer_history():
+    body = Body()
+    client = UndaClient(body, style=COLUMNAR, stack_height=3)
+    for step in range(5):
+        body.vx = step
+        client.update()
+    assert list(client.history('vx')) == [2, 3, 4]
+    assert list(client.history('vx', 2)) == [3, 4]
+
+
+def test_columnar_history_is_a_copy():
+    body = Body()
+    client = UndaClient(body, style=COLUMNAR, stack_height=3)
+    history = client.history('vx')
+    for step in range(1, 4):
+        body.vx = step
+        client.update()
+    assert list(history) == [0]
+
+
+def test_columnar_history_with_numpy():
+    numpy = pytest.importorskip('numpy')
+    body = Body()
+    client = UndaClient(body, style=COLUMNAR, stack_height=3)
+    for step in range(1, 3):
+        body.vx = step
+        client.update()
+    history = client.history('vx')
+    assert isinstance(history, numpy.ndarray) and history.dtype == numpy.int64
+    for step in range(3, 6):
+        body.vx = step
+        client.update()
+    assert history.tolist() == [0, 1, 2]
+    assert client.history('vx').tolist() == [3, 4, 5]
@@ -0,0 +1,133 @@
+import pickle
+from copy import deepcopy
+
+from unda import UndaClient, UndaManager, UndaObject
+
+
+class Counter(UndaObject):
+
+    def __init__(self):
+        self.x = 0
+        UndaObject.__init__(self)
+
+
+class Plain:
+
+    def __init__(self):
+        self.x = 0
+
+
+def undo_lengths(manager):
+    return {key: len(client.undo_stack) for key, client in manager.objects.items()}
+
+
+def test_update_all_only_visits_dirty_clients():
+    manager = UndaManager(track_changes=True)
+    counters = [Counter() for _ in range(3)]
+    for index, counter in enumerate(counters):
+        manager[index] = counter.client
+    manager.update_all()
+    manager.update_all()
+    assert undo_lengths(manager) == {0: 2, 1: 2, 2: 2}
+    counters[1].x = 5
+    manager.update_all()
+    assert undo_lengths(manager) == {0: 2, 1: 3, 2: 2}
+
+
+def test_update_all_visits_every_client_without_tracking():
+    manager = UndaManager()
+    manager['plain'] = Plain()
+    manager.update_all()
+    manager.update_all()
+    assert undo_lengths(manager) == {'plain': 3}
+
+
+def test_undaobjects_added_directly_are_tracked():
+    manager = UndaManager(track_changes=True)
+    counter = Counter()
+    manager['counter'] = counter
+    assert manager['counter'] is counter.client
+    manager.update_all()
+    manager.update_all()
+    assert undo_lengths(manager) == {'counter': 2}
+    counter.x = 5
+    manager.update_all()
+    assert undo_lengths(manager) == {'counter': 3}
+    assert counter.undo() is None
+    assert counter.x == 5
+
+
+def test_snapshots_do_not_copy_managers():
+    manager = UndaManager(track_changes=True)
+    counter = Counter()
+    manager['counter'] = counter.client
+    counter.update()
+    assert counter.client.undo_stack[-1].client is counter.client
+
+
+def test_dirty_tracking_survives_inplace_undo():
+    manager = UndaManager(track_changes=True)
+    counter = Counter()
+    manager['counter'] = counter.client
+    counter.update()
+    counter.x = 3
+    manager.update_all()
+    counter.client.undo(inplace=True)
+    manager.update_all()
+    length = len(counter.client.undo_stack)
+    manager.update_all()
+    assert len(counter.client.undo_stack) == length
+    counter.x = 10
+    manager.update_all()
+    assert len(counter.client.undo_stack) == length + 1
+
+
+def test_direct_object_dict_edits_are_tracked():
+    manager = UndaManager(track_changes=True)
+    client = UndaClient(Plain())
+    manager.objects['plain'] = client
+    manager.update_all()
+    assert len(client.undo_stack) == 2
+    manager.objects.pop('plain')
+    client.mark_dirty()
+    manager.update_all()
+    assert len(client.undo_stack) == 2
+
+
+def test_clear_stacks_with_tracking():
+    manager = UndaManager(track_changes=True)
+    first, second = UndaClient(Plain()), UndaClient(Plain())
+    manager.add_objects({'first': first, 'second': second})
+    manager.update_all()
+    first.undo()
+    manager.clear_all_stacks()
+    assert len(first.undo_stack) == len(first.redo_stack) == 0
+    assert len(second.undo_stack) == len(second.redo_stack) == 0
+
+
+def test_undo_without_inplace_keeps_client_dirty():
+    manager = UndaManager(track_changes=True)
+    plain = Plain()
+    manager['plain'] = plain
+    client = manager['plain']
+    manager.update_all()
+    plain.x = 1
+    manager.mark_dirty('plain')
+    client.undo()
+    manager.update_all()
+    assert len(client.undo_stack) == 2
+    assert len(client.redo_stack) == 0
+
+
+def test_pickle_and_deepcopy_round_trip():
+    manager = UndaManager(track_changes=True)
+    manager['plain'] = Plain()
+    manager.update_all()
+    for copied in (pickle.loads(pickle.dumps(manager)), deepcopy(manager)):
+        assert undo_lengths(copied) == {'plain': 2}
+        client = copied['plain']
+        client.target.x = 4
+        client.mark_dirty()
+        copied.update_all()
+        assert undo_lengths(copied) == {'plain': 3}
+        assert undo_lengths(manager) == {'plain': 2}
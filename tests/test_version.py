@@ -0,0 +1,64 @@
+import warnings
+
+import pytest
+
+from unda.functions import _deprecated
+from unda.version import Version
+
+
+def test_versions_are_ordered_by_parts():
+    assert Version('1.10.0') < Version('2.0.0')
+    assert Version('1.10.0') > Version('1.9.9')
+    assert Version(1, 2, 3) <= Version('v1.2.3')
+    assert sorted([Version('1.10.0'), Version('1.9.9'), Version('1.2.0')]) == \
+        [Version('1.2.0'), Version('1.9.9'), Version('1.10.0')]
+
+
+def test_equal_versions_hash_equally():
+    assert Version(1, 1, 2) == Version('Version 1.1.2')
+    assert hash(Version(1, 1, 2)) == hash(Version('Version 1.1.2'))
+    assert len({Version(1, 1, 2), Version('1.1.2b'), Version(1, 1, 3)}) == 2
+    assert Version(1) != (1, 0, 0)
+
+
+def test_versions_are_immutable():
+    version = Version(1, 1, 2)
+    with pytest.raises(AttributeError):
+        version.minor = 3
+    with pytest.raises(TypeError):
+        version.shift_minor(3)
+    with pytest.raises(TypeError):
+        version.set_values(1, 2, 3)
+    assert version.shifted(minor=3) == Version(1, 4, 2)
+    assert version == Version(1, 1, 2)
+
+
+def test_functions_not_deprecated_yet_are_returned_untouched():
+    def function():
+        return 1
+
+    assert _deprecated(version='99.0.0')(function) is function
+
+
+def test_deprecated_functions_warn_on_every_call():
+    def function():
+        """Does things."""
+        return 1
+
+    wrapped = _deprecated(version='1.1.0', use_instead='other')(function)
+    assert wrapped.__name__ == 'function'
+    assert wrapped.__doc__ == 'DEPRECATED since version 1.1.0.\nDoes things.'
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        assert wrapped() == 1
+        assert wrapped() == 1
+    assert len(caught) == 2
+    assert 'Please use `other` instead.' in str(caught[0].message)
+    assert wrapped.__doc__.count('DEPRECATED') == 1
+
+
+def test_past_due_deprecations_fail_at_decoration_time():
+    with pytest.raises(SystemError):
+        @_deprecated(version='0.1.0')
+        def function():
+            pass
@@ -23,7 +23,9 @@ the beginning of the module's source code._
 
 __name__ = "unda"
 
-from .constants import RESERVED_NAMES, DEEPCOPY, LOGGER, __version__
+from .constants import RESERVED_NAMES, DEEPCOPY, LOGGER, SLOTS, COLUMNAR, SHARED, __version__
 from .unda_manager import UndaManager
 from .unda_object import UndaObject
 from .unda_client import UndaClient
+from .columnar_stack import ColumnarStack
+from .shared_stack import SharedStack
@@ -0,0 +1,219 @@
+from array import array
+from copy import deepcopy
+from typing import Dict, Iterator, List, Optional, Union
+
+from .functions import _UNSET
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_INT_MIN, _INT_MAX = -2 ** 63, 2 ** 63 - 1
+_NAN = float('nan')
+# Per-slot tags of numeric columns.
+_TAG_UNSET, _TAG_INT, _TAG_FLOAT = 0, 1, 2
+
+
+class _NumericColumn:
+    # A column of ints and floats: one typed array for each (created when first needed) and a tag per slot telling
+    # which of them holds the value, so that every value is given back exactly, with its type.
+    __slots__ = ('ints', 'floats', 'tags')
+
+    def __init__(self, maxlen: int):
+        self.ints: Optional[array] = None
+        self.floats: Optional[array] = None
+        self.tags = bytearray(maxlen)
+
+    def store(self, slot: int, value) -> bool:
+        # Returns False if the value can't be held by the column.
+        if value is _UNSET:
+            tag = _TAG_UNSET
+        elif type(value) is float:
+            if self.floats is None:
+                self.floats = array('d', [_NAN]) * len(self.tags)
+            self.floats[slot] = value
+            tag = _TAG_FLOAT
+        elif type(value) is int and _INT_MIN <= value <= _INT_MAX:
+            if self.ints is None:
+                self.ints = array('q', bytes(8 * len(self.tags)))
+            self.ints[slot] = value
+            tag = _TAG_INT
+        else:
+            return False
+        # Keep the other array neutral in this slot, for `ColumnarStack.column()`.
+        if tag != _TAG_FLOAT and self.floats is not None:
+            self.floats[slot] = _NAN
+        if tag != _TAG_INT and self.ints is not None:
+            self.ints[slot] = 0
+        self.tags[slot] = tag
+        return True
+
+    def get(self, slot: int):
+        tag = self.tags[slot]
+        if tag == _TAG_INT:
+            return self.ints[slot]
+        if tag == _TAG_FLOAT:
+            return self.floats[slot]
+        return _UNSET
+
+
+class ColumnarStack:
+    """
+    The `ColumnarStack` class.
+    A deque-like stack of object states, used by `UndaClient`s with the `COLUMNAR` style.
+
+    Every attribute gets its own column with one slot per state. Attributes which hold `float` and `int` values are
+    stored in compact typed arrays (`array('d')` and `array('q')` respectively), with a tag per state telling which
+    of the two holds the value, so an attribute may switch between ints and floats and still be restored exactly.
+    All other attributes fall back to lists of deep-copies; a numeric column is only turned into a list column when
+    it meets a value it can't hold (e.g. a `bool`, a `str` or an int beyond 64 bits).
+
+    Columns are ring buffers of `maxlen` slots, so pushing onto a full stack drops the oldest state, just like a
+    `deque` with a `maxlen`.
+    ## Parameters
+    ### _maxlen:_
+    The maximum number of states to store.
+    """
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._columns: Dict[str, Union[_NumericColumn, List]] = {}
+        self._start = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(self._length):
+            yield self.row(index)
+
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('ColumnarStack index out of range.')
+        return (self._start + index) % self.maxlen
+
+    def _new_column(self, name: str, value) -> None:
+        # Earlier states are backfilled as unset.
+        if type(value) in (int, float):
+            self._columns[name] = _NumericColumn(self.maxlen)
+        else:
+            self._columns[name] = [_UNSET] * self.maxlen
+
+    def _store(self, name: str, slot: int, value) -> None:
+        column = self._columns[name]
+        if type(column) is _NumericColumn:
+            if column.store(slot, value):
+                return
+            column = self._columns[name] = [column.get(index) for index in range(self.maxlen)]
+        column[slot] = value if value is _UNSET else deepcopy(value)
+
+    def append(self, state: Dict) -> None:
+        """
+        Pushes a state onto the top of the stack, dropping the oldest state if the stack is full.
+        ## Parameters
+        ### _state:_
+        A dict of attribute values.
+        """
+        if self._length == self.maxlen:
+            self._start = (self._start + 1) % self.maxlen
+            self._length -= 1
+        slot = (self._start + self._length) % self.maxlen
+        for name, value in state.items():
+            if name not in self._columns:
+                self._new_column(name, value)
+        self._length += 1
+        for name in self._columns:
+            self._store(name, slot, state.get(name, _UNSET))
+
+    def row(self, index: int) -> Dict:
+        """
+        Returns the state at the specified index (0 being the oldest) as a dict of attribute values, reading one slot
+        from each column. Attributes which were not set in that state are omitted.
+        ## Parameters
+        ### _index:_
+        The index of the state. Negative indices count from the top of the stack.
+        """
+        slot = self._slot(index)
+        state = {}
+        for name, column in self._columns.items():
+            value = column.get(slot) if type(column) is _NumericColumn else column[slot]
+            if value is not _UNSET:
+                state[name] = value
+        return state
+
+    def pop(self) -> Dict:
+        """
+        Removes and returns the state at the top of the stack.
+        """
+        state = self.row(-1)
+        self._length -= 1
+        return state
+
+    def popleft(self) -> Dict:
+        """
+        Removes and returns the state at the bottom of the stack.
+        """
+        state = self.row(0)
+        self._start = (self._start + 1) % self.maxlen
+        self._length -= 1
+        return state
+
+    def clear(self) -> None:
+        """
+        Removes all states from the stack.
+        """
+        self._columns.clear()
+        self._start = 0
+        self._length = 0
+
+    def column(self, name: str, count: Optional[int] = None):
+        """
+        Returns a copy of the values of an attribute across the latest states, oldest first.
+
+        For numeric columns, the result is a NumPy array if NumPy is installed, or an `array` otherwise. It holds ints
+        if the attribute only held ints in those states, and floats otherwise (ints converted); states in which the
+        attribute was unset hold NaN in float results and 0 in int results. For other columns, it's a list, with None
+        for unset states.
+        ## Parameters
+        ### _name:_
+        The name of the attribute.
+        ### _count:_
+        The number of latest states to include. Defaults to all of them.
+        """
+        column = self._columns[name]
+        if count is None or count > self._length:
+            count = self._length
+        begin = (self._start + self._length - count) % self.maxlen
+        end = begin + count
+        segments = [(begin, min(end, self.maxlen))] + ([(0, end - self.maxlen)] if end > self.maxlen else [])
+
+        if type(column) is list:
+            return [None if value is _UNSET else value
+                    for first, last in segments for value in column[first:last]]
+
+        tags = [tag for first, last in segments for tag in column.tags[first:last]]
+        floats_only = _TAG_INT not in tags and column.floats is not None
+        if column.ints is None or floats_only:
+            source = column.floats if column.floats is not None else column.ints
+            if numpy is not None:
+                values = numpy.frombuffer(source, dtype='f8' if source.typecode == 'd' else 'i8')
+                return numpy.concatenate([values[first:last] for first, last in segments])
+            result = array(source.typecode)
+            for first, last in segments:
+                result.extend(source[first:last])
+            return result
+        if _TAG_FLOAT not in tags:
+            if numpy is not None:
+                values = numpy.frombuffer(column.ints, dtype='i8')
+                return numpy.concatenate([values[first:last] for first, last in segments])
+            result = array('q')
+            for first, last in segments:
+                result.extend(column.ints[first:last])
+            return result
+        values = [column.get(slot) for first, last in segments for slot in range(first, last)]
+        values = [_NAN if value is _UNSET else float(value) for value in values]
+        return numpy.array(values, dtype='f8') if numpy is not None else array('d', values)
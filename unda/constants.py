@@ -7,3 +7,6 @@ STACK_HEIGHT = 30
 RESERVED_NAMES = ['target_dict', 'undo_stack', 'redo_stack', 'stack_height']
 DEEPCOPY = 'DEEPCOPY'
 LOGGER = 'LOGGER'
+SLOTS = 'SLOTS'
+COLUMNAR = 'COLUMNAR'
+SHARED = 'SHARED'
@@ -1,6 +1,7 @@
-from copy import copy
-from functools import wraps
-from typing import Optional, Dict
+from copy import deepcopy
+from dataclasses import fields as dataclass_fields, is_dataclass
+from functools import lru_cache, wraps
+from typing import Optional, Dict, Tuple
 from warnings import warn
 
 from .constants import RESERVED_NAMES, VERSION as current_version
@@ -28,36 +29,148 @@ def extract_changes(original, changed) -> Optional[Dict]:
     return checklist_anomalies if len(checklist_anomalies) > 0 else None
 
 
+class _Unset:
+    # Marks fields which have not been set. Copying or unpickling it gives back the same marker.
+    def __repr__(self):
+        return '<unset>'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return '_UNSET'
+
+
+_UNSET = _Unset()
+
+
+@lru_cache(maxsize=None)
+def get_fields(cls: type) -> Tuple[str, ...]:
+    """
+    Obtains and returns the names of the fields declared by a class, in declaration order.
+    The result is computed once per class and cached.
+
+    Fields are gathered from namedtuple `_fields`, attrs `__attrs_attrs__`, dataclass fields and `__slots__`
+    (throughout the MRO, with private names mangled). An empty tuple is returned if the class declares none.
+
+    ## Parameters
+    ### _cls:_
+    The class to inspect.
+    """
+    names = []
+    if issubclass(cls, tuple) and hasattr(cls, '_fields'):
+        names.extend(cls._fields)
+    names.extend(attribute.name for attribute in getattr(cls, '__attrs_attrs__', ()))
+    if is_dataclass(cls):
+        names.extend(field.name for field in dataclass_fields(cls))
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for slot in slots:
+            if slot in ('__dict__', '__weakref__'):
+                continue
+            if slot.startswith('__') and not slot.endswith('__'):
+                slot = f'_{klass.__name__.lstrip("_")}{slot}'
+            names.append(slot)
+    return tuple(name for name in dict.fromkeys(names) if name not in RESERVED_NAMES)
+
+
+def read_fields(target, fields) -> Dict:
+    """
+    Obtains and returns a dict of the current values of the specified fields of an object.
+    Fields which have not been set are marked with an internal sentinel.
+
+    ## Parameters
+    ### _target:_
+    The object to read from.
+
+    ### _fields:_
+    The names of the fields to read, as returned by `get_fields()`.
+    """
+    return {name: getattr(target, name, _UNSET) for name in fields}
+
+
+def write_fields(target, state) -> None:
+    """
+    Restores the fields of an object in place from a dict of field values, using `setattr`.
+    Fields marked as unset in the dict are deleted from the object.
+
+    ## Parameters
+    ### _target:_
+    The object to write to.
+
+    ### _state:_
+    A dict of field values, as returned by `read_fields()`.
+    """
+    for name, value in state.items():
+        if value is _UNSET:
+            if hasattr(target, name):
+                delattr(target, name)
+        else:
+            setattr(target, name, value)
+
+
+def extract_field_changes(original, target, fields) -> Optional[Tuple]:
+    """
+    Obtains and returns the changes to the fields of an object as a tuple of `(name, value)` pairs, by comparing
+    them against a dict of field values. A tuple is used rather than a dict to keep stored states compact.
+    Changed values are deep-copied, so that later in-place changes to them don't leak into the result.
+
+    ## Parameters
+    ### _original:_
+    Dict of field values to compare against.
+
+    ### _target:_
+    The object to be compared for differences.
+
+    ### _fields:_
+    The names of the fields to compare.
+    """
+    changes = []
+    for name in fields:
+        value = getattr(target, name, _UNSET)
+        if name not in original or original[name] is not value and original[name] != value:
+            changes.append((name, deepcopy(value)))
+    return tuple(changes) if changes else None
+
+
 def _deprecated(version, deprecation_target='minor', deadline=3, use_instead=None):
     """
     WARNING: Internal use only. No QA for end users.
 
-    Checks the current project version and compares it to the given version.
-    
-    If the current version is lower than the given version, nothing happens.
-    
+    Checks the current project version and compares it to the given version, once, when the function is decorated.
+
+    If the current version is lower than the given version, the function is returned untouched.
+
     If the current version's target value (e.g. minor) is higher or equal to the given version's target
-    value, a warning will be triggered.
+    value, the function is wrapped so that a warning is triggered whenever it's called.
+
+    If the deadline has passed, a `SystemError` is raised at decoration (import) time.
     """
+    given_version = Version(version)
+    deadline_version = given_version.shifted(**{deprecation_target: deadline})
+
     def _inner(func):
+        if current_version >= deadline_version:
+            message = f'`{func.__name__}` needs to be removed; its deprecation version ({deadline_version}) is past due.'
+            raise SystemError(message)
+
+        if current_version < given_version:
+            return func
+
+        warning = f'The `{func.__name__}` function has been deprecated! It will still work, but will be fully '\
+            f'removed in the next{" "+str(deadline)+" " or " "}{deprecation_target} {"releases" if deadline > 1 else "release"}.'\
+            f'{" Please use `"+str(use_instead)+"` instead." if use_instead else ""}'
+
+        @wraps(func)
         def _wrapper(*args, **kwargs):
-            
-            given_version = Version(version)
-            deadline_version = copy(given_version)
-            exec(f'deadline_version.shift_{deprecation_target}(deadline)')
-            
-            if current_version >= deadline_version:
-                message = f'`{func.__name__}` needs to be removed; its deprecation version ({deadline_version}) is past due.'
-                raise SystemError(message)
-            
-            elif current_version >= given_version < deadline_version:
-                warning = f'The `{func.__name__}` function has been deprecated! It will still work, but will be fully '\
-                f'removed in the next{" "+str(deadline)+" " or " "}{deprecation_target} {"releases" if deadline > 1 else "release"}.'\
-                f'{" Please use `"+str(use_instead)+"` instead." if use_instead else ""}'
-                warn(warning, stacklevel=2)
-                func.__doc__  = f'DEPRECATED since version {version}.\n' + func.__doc__
-                
+            warn(warning, stacklevel=2)
             return func(*args, **kwargs)
+
+        _wrapper.__doc__ = f'DEPRECATED since version {version}.\n' + (func.__doc__ or '')
         return _wrapper
     return _inner
-            
@@ -0,0 +1,260 @@
+import pickle
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from time import sleep
+from typing import Dict, Iterator, List, Optional
+from weakref import finalize
+
+# The generation counter is written on its own, before and after the other header fields.
+_GENERATION = Struct('<Q')
+# next_sequence, head, length, capacity, slot_size
+_FIELDS = Struct('<QQQII')
+_HEADER_SIZE = _GENERATION.size + _FIELDS.size
+# sequence, length of the pickled state
+_SLOT = Struct('<QI')
+
+
+def _release(shm: SharedMemory, owner: bool) -> None:
+    shm.close()
+    if owner:
+        shm.unlink()
+
+
+class SharedStack:
+    """
+    The `SharedStack` class.
+    A deque-like stack of object states kept in a `multiprocessing.shared_memory` ring buffer, used by `UndaClient`s
+    with the `SHARED` style, so that other processes on the same machine can read the history without receiving
+    copies of it.
+
+    One process (the writer) owns the stack and pushes pickled states onto it. Any number of reader processes can
+    `attach()` to it by name and decode any stored state directly from shared memory.
+
+    Every pushed state gets a new sequence number, one higher than the last one handed out. Numbers are never
+    reused: when a state is popped (e.g. by an undo), its number simply disappears, so the numbers in the stack are
+    increasing but not necessarily contiguous, and a reader asking for a popped number gets an `IndexError` rather
+    than another state. Every change to the stack bumps a generation counter (odd while the change is in progress)
+    which readers use to detect and retry torn reads.
+
+    The shared memory block is destroyed when the writer calls `close()`, or when its `SharedStack` is garbage-collected
+    or the process exits. Readers should `close()` their own handles once they are done.
+    ## Parameters
+    ### _maxlen:_
+    The maximum number of states to store.
+    ### _slot_size:_
+    The maximum size in bytes of a pickled state. Defaults to 64 KiB.
+    ### _name:_
+    The name of the shared memory block to create. If none is passed (by default), a unique name is generated.
+    """
+
+    def __init__(self, maxlen: int, slot_size: int = 65536, name: Optional[str] = None):
+        self._shm = SharedMemory(name=name, create=True,
+                                 size=_HEADER_SIZE + maxlen * (_SLOT.size + slot_size))
+        self._owner = True
+        self._finalizer = finalize(self, _release, self._shm, True)
+        _GENERATION.pack_into(self._shm.buf, 0, 0)
+        _FIELDS.pack_into(self._shm.buf, _GENERATION.size, 0, 0, 0, maxlen, slot_size)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedStack':
+        """
+        Attaches to an existing `SharedStack` by name, for reading it from another process.
+        ## Parameters
+        ### _name:_
+        The `name` of the `SharedStack` to attach to.
+        """
+        stack = cls.__new__(cls)
+        try:
+            stack._shm = SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 can't opt out of tracking, which would destroy the block when this process exits.
+            stack._shm = SharedMemory(name=name)
+            resource_tracker.unregister(stack._shm._name, 'shared_memory')
+        stack._owner = False
+        stack._finalizer = finalize(stack, _release, stack._shm, False)
+        return stack
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the shared memory block, to be passed to `attach()`.
+        """
+        return self._shm.name
+
+    @property
+    def maxlen(self) -> int:
+        """
+        The maximum number of states to store.
+        """
+        return _FIELDS.unpack_from(self._shm.buf, _GENERATION.size)[3]
+
+    @property
+    def start(self) -> int:
+        """
+        The sequence number of the oldest stored state, or `end` if the stack is empty.
+        """
+        sequences = self.sequences()
+        return sequences[0] if sequences else self.end
+
+    @property
+    def end(self) -> int:
+        """
+        The sequence number the next pushed state will get.
+        """
+        return self._consistent(lambda next_sequence, *_: next_sequence)
+
+    def __len__(self) -> int:
+        return self._consistent(lambda _, head, length, *__: length)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for sequence in self.sequences():
+            yield self.state(sequence)
+
+    def __getitem__(self, index: int) -> Dict:
+        sequences = self.sequences()
+        return self.state(sequences[index])
+
+    def _slot_offset(self, position: int, capacity: int, slot_size: int) -> int:
+        return _HEADER_SIZE + (position % capacity) * (_SLOT.size + slot_size)
+
+    def _consistent(self, read):
+        # Calls `read` with the header fields until it runs without the writer changing the stack in the meantime.
+        buffer = self._shm.buf
+        while True:
+            generation = _GENERATION.unpack_from(buffer, 0)[0]
+            if generation % 2:
+                sleep(0)
+                continue
+            result = read(*_FIELDS.unpack_from(buffer, _GENERATION.size))
+            if _GENERATION.unpack_from(buffer, 0)[0] == generation:
+                return result
+
+    def _read_sequences(self, _, head: int, length: int, capacity: int, slot_size: int) -> List[int]:
+        buffer = self._shm.buf
+        return [_SLOT.unpack_from(buffer, self._slot_offset(head + index, capacity, slot_size))[0]
+                for index in range(length)]
+
+    def sequences(self) -> List[int]:
+        """
+        Returns the sequence numbers of the stored states, oldest first.
+        """
+        return self._consistent(self._read_sequences)
+
+    def state(self, sequence: int) -> Dict:
+        """
+        Decodes and returns the state with the specified sequence number directly from shared memory.
+        ## Parameters
+        ### _sequence:_
+        The sequence number of the state.
+        """
+        buffer = self._shm.buf
+
+        def read(_, head, length, capacity, slot_size):
+            # Sequence numbers increase from the bottom of the stack to the top, so the slot is found by bisection.
+            low, high = 0, length
+            while low < high:
+                middle = (low + high) // 2
+                offset = self._slot_offset(head + middle, capacity, slot_size)
+                stored, size = _SLOT.unpack_from(buffer, offset)
+                if stored == sequence:
+                    return bytes(buffer[offset + _SLOT.size:offset + _SLOT.size + min(size, slot_size)])
+                if stored < sequence:
+                    low = middle + 1
+                else:
+                    high = middle
+            return None
+
+        data = self._consistent(read)
+        if data is None:
+            raise IndexError(f'State {sequence} is not in the SharedStack.')
+        return pickle.loads(data)
+
+    def column(self, name: str, count: Optional[int] = None) -> List:
+        """
+        Returns the values of an attribute across the latest states, oldest first, as a list with None for states in
+        which the attribute was unset. Every state involved is decoded, so this is slower than
+        `ColumnarStack.column()`.
+        ## Parameters
+        ### _name:_
+        The name of the attribute.
+        ### _count:_
+        The number of latest states to include. Defaults to all of them.
+        """
+        sequences = self.sequences()
+        if count is not None:
+            sequences = sequences[len(sequences) - min(count, len(sequences)):]
+        return [self.state(sequence).get(name) for sequence in sequences]
+
+    def _begin(self) -> int:
+        generation = _GENERATION.unpack_from(self._shm.buf, 0)[0]
+        _GENERATION.pack_into(self._shm.buf, 0, generation + 1)
+        return generation
+
+    def _commit(self, generation: int, next_sequence: int, head: int, length: int) -> None:
+        capacity, slot_size = _FIELDS.unpack_from(self._shm.buf, _GENERATION.size)[3:]
+        _FIELDS.pack_into(self._shm.buf, _GENERATION.size, next_sequence, head, length, capacity, slot_size)
+        _GENERATION.pack_into(self._shm.buf, 0, generation + 2)
+
+    def append(self, state: Dict) -> None:
+        """
+        Pushes a state onto the top of the stack, dropping the oldest state if the stack is full.
+        Only the process which created the stack may call this.
+        ## Parameters
+        ### _state:_
+        A dict of attribute values.
+        """
+        self._check_owner()
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        next_sequence, head, length, capacity, slot_size = _FIELDS.unpack_from(self._shm.buf, _GENERATION.size)
+        if len(data) > slot_size:
+            raise ValueError(f'The pickled state ({len(data)} bytes) is larger than the slot size ({slot_size} bytes).')
+        generation = self._begin()
+        if length == capacity:
+            head, length = head + 1, length - 1
+        offset = self._slot_offset(head + length, capacity, slot_size)
+        _SLOT.pack_into(self._shm.buf, offset, next_sequence, len(data))
+        self._shm.buf[offset + _SLOT.size:offset + _SLOT.size + len(data)] = data
+        self._commit(generation, next_sequence + 1, head % capacity, length + 1)
+
+    def pop(self) -> Dict:
+        """
+        Removes and returns the state at the top of the stack.
+        Only the process which created the stack may call this.
+        """
+        self._check_owner()
+        state = self[-1]
+        next_sequence, head, length, _, _ = _FIELDS.unpack_from(self._shm.buf, _GENERATION.size)
+        self._commit(self._begin(), next_sequence, head, length - 1)
+        return state
+
+    def popleft(self) -> Dict:
+        """
+        Removes and returns the state at the bottom of the stack.
+        Only the process which created the stack may call this.
+        """
+        self._check_owner()
+        state = self[0]
+        next_sequence, head, length, capacity, _ = _FIELDS.unpack_from(self._shm.buf, _GENERATION.size)
+        self._commit(self._begin(), next_sequence, (head + 1) % capacity, length - 1)
+        return state
+
+    def clear(self) -> None:
+        """
+        Removes all states from the stack. Sequence numbers keep increasing from where they were.
+        Only the process which created the stack may call this.
+        """
+        self._check_owner()
+        next_sequence, head, _, _, _ = _FIELDS.unpack_from(self._shm.buf, _GENERATION.size)
+        self._commit(self._begin(), next_sequence, head, 0)
+
+    def _check_owner(self) -> None:
+        if not self._owner:
+            raise PermissionError('Only the process which created a SharedStack can change it.')
+
+    def close(self) -> None:
+        """
+        Detaches this process from the shared memory block. If this process created the stack, the block is also
+        destroyed, so readers should be done with it by then. Calling it more than once does nothing.
+        """
+        self._finalizer()
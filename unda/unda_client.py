@@ -1,9 +1,15 @@
 from collections import deque
 from copy import copy, deepcopy
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+from weakref import WeakKeyDictionary, WeakSet
 
-from .constants import DEEPCOPY, LOGGER, RESERVED_NAMES, STACK_HEIGHT
-from .functions import extract_changes
+from .columnar_stack import ColumnarStack
+from .shared_stack import SharedStack
+from .constants import COLUMNAR, DEEPCOPY, LOGGER, RESERVED_NAMES, SHARED, SLOTS, STACK_HEIGHT
+from .functions import _UNSET, extract_changes, extract_field_changes, get_fields, read_fields, write_fields
+
+# The UndaManagers each Client is entrusted to. Kept outside the Clients so that copies of them don't carry it along.
+_MANAGERS: 'WeakKeyDictionary[UndaClient, WeakSet]' = WeakKeyDictionary()
 
 
 class UndaClient:
@@ -21,9 +27,20 @@ class UndaClient:
     The object itself.
     ### _style:_
     The `style` parameter specifies how this Client handles object state data.
-    There are two different styles:
+    There are five different styles:
     * `DEEPCOPY` style: With this style, states are regarded as deep-copies of the target object.
     * `LOGGER` style: This style regards states as changes to the `__dict__` attribute of the target object.
+    * `SLOTS` style: This style regards states as changes to the declared fields of the target object (`__slots__`,
+    dataclass and attrs fields, or namedtuple fields), and restores them in place using `setattr`. It is chosen
+    automatically for targets which have declared fields but no `__dict__`.
+    * `COLUMNAR` style: This style regards states as rows of a `ColumnarStack`, which stores `float` and `int`
+    attributes in compact typed columns and deep-copies the rest. Best for targets whose history is mostly numeric;
+    use `history()` to query an attribute across states. It is never chosen automatically.
+    * `SHARED` style: This style regards states as dicts of attribute values, like the `COLUMNAR` style does, but
+    keeps the undo stack pickled in a `SharedStack`, so other processes can read it with
+    `SharedStack.attach(client.undo_stack.name)`. The redo stack stays private. Each pickled state must fit in a
+    slot of 64 KiB; for bigger targets, pass your own stack, e.g. `undo_stack=SharedStack(maxlen=30, slot_size=2**20)`.
+    Call `close()` to release the shared memory once readers are done. It is never chosen automatically.
     If left unspecified, Unda will resort to the best method for the current scenario.
     To specify a desired style and override Unda's judgement (not recommended), import the name of the style you want,
     e.g.:
@@ -36,10 +53,11 @@ class UndaClient:
     need to call `update()` after creating the Client.
     ### _undo_stack:_
     If any deque is passed, it will be used as the undo stack for the Client. If none is passed (by default), a new
-    deque will be created for that purpose.
+    deque (or `ColumnarStack` for the `COLUMNAR` style, or `SharedStack` for the `SHARED` style) will be created for
+    that purpose.
     ### _redo_stack:_
     If any deque is passed, it will be used as the redo stack for the Client. If none is passed (by default), a new
-    deque will be created for that purpose.
+    deque (or `ColumnarStack` for the `COLUMNAR` style) will be created for that purpose.
     ### _stack_height:_
     The maximum number of states to store in either stack. Defaults to 30.
     """
@@ -60,6 +78,7 @@ class UndaClient:
         self.undo_stack = undo_stack
         self.redo_stack = redo_stack
         self._target_dict: Optional[Dict] = None
+        self._fields: Tuple[str, ...] = ()
 
         self._init_stack_height()
         self._init_undo_stack()
@@ -74,15 +93,27 @@ class UndaClient:
             self.stack_height = STACK_HEIGHT
 
     def _init_undo_stack(self):
-        if self.undo_stack is None:
+        if self.undo_stack is None and self.style == COLUMNAR:
+            self.undo_stack = ColumnarStack(maxlen=self.stack_height)
+        elif self.undo_stack is None and self.style == SHARED:
+            self.undo_stack = SharedStack(maxlen=self.stack_height)
+        elif self.undo_stack is None:
             self.undo_stack = deque(maxlen=self.stack_height)
 
     def _init_redo_stack(self):
-        if self.redo_stack is None:
+        if self.redo_stack is None and self.style in (COLUMNAR, SHARED):
+            self.redo_stack = ColumnarStack(maxlen=self.stack_height)
+        elif self.redo_stack is None:
             self.redo_stack = deque(maxlen=self.stack_height)
 
     def _init_style(self):
-        if self.style is None:
+        if self.style is None and not hasattr(self.target, '__dict__') and get_fields(type(self.target)):
+            self.style = SLOTS
+        if self.style in (SLOTS, COLUMNAR, SHARED):
+            self._fields = get_fields(type(self.target))
+        if self.style == SLOTS:
+            self._target_dict = deepcopy(read_fields(self.target, self._fields))
+        elif self.style is None:
             if 'dict' in vars(self.target) and self.target.__sizeof__() > self.target.__dict__.__sizeof__():
                 self._target_dict = self.__dict__.copy()
                 self.style = LOGGER
@@ -91,7 +122,7 @@ class UndaClient:
 
     def _auto_first_update(self):
         if self.style == DEEPCOPY:
-            self.undo_stack.append(deepcopy(self.target))
+            self.undo_stack.append(self._snapshot())
             self.clear_redo_stack()
         elif self.style == LOGGER:
             if len(self.undo_stack) == self.undo_stack.maxlen:
@@ -102,6 +133,80 @@ class UndaClient:
             self.undo_stack.append(checklist_anomalies)
             self.clear_redo_stack()
             del checklist_anomalies
+        elif self.style == SLOTS:
+            self._push_field_changes(self.undo_stack)
+            self.clear_redo_stack()
+        elif self.style in (COLUMNAR, SHARED):
+            self.undo_stack.append(self._read_state())
+            self.clear_redo_stack()
+
+    def _snapshot(self) -> object:
+        # Deep-copies the target, but keeps references to this Client (e.g. in UndaObjects) pointing at this Client.
+        return deepcopy(self.target, {id(self): self})
+
+    def _read_state(self) -> Dict:
+        # Reads every set attribute of the target, except the ones which refer back to this Client (e.g. in
+        # UndaObjects). Unset fields are left out, as missing attributes already mean unset to `_restore_fields()`.
+        if hasattr(self.target, '__dict__'):
+            names = self._fields + tuple(name for name in vars(self.target)
+                                         if name not in RESERVED_NAMES and name not in self._fields)
+        else:
+            names = self._fields
+        return {name: value for name, value in read_fields(self.target, names).items()
+                if value is not self and value is not _UNSET}
+
+    def _push_field_changes(self, stack: deque) -> None:
+        # Records the fields of the target which differ from the compiled undo stack onto the given stack.
+        # If the undo stack is full, its oldest change is made permanent in the target_dict first.
+        if stack is self.undo_stack and len(self.undo_stack) == self.undo_stack.maxlen:
+            change = self.undo_stack.popleft()
+            if change is not None:
+                self._target_dict.update(change)
+        stack.append(extract_field_changes(self.compile_stack(), self.target, self._fields))
+
+    def _restore_fields(self, state: Dict, inplace: bool) -> Optional[object]:
+        if isinstance(self.target, tuple):
+            if inplace:
+                raise TypeError(f'`{type(self.target).__name__}` objects are immutable and can\'t be restored in place.')
+            return self.target._replace(**state)
+        if self.style == SLOTS:
+            # Stored values must stay untouched by later in-place changes to the target.
+            state = deepcopy(state)
+        if self.style in (COLUMNAR, SHARED):
+            # Attributes missing from a stored state were not set in it.
+            state = {**{name: _UNSET for name in self._read_state()}, **state}
+        if inplace:
+            write_fields(self.target, state)
+            return None
+        result = copy(self.target)
+        write_fields(result, state)
+        return result
+
+    def history(self, name: str, count: Optional[int] = None):
+        """
+        Useful only when using `COLUMNAR` or `SHARED` style.
+        Returns the values of an attribute across the latest states in the undo stack, oldest first. See
+        `ColumnarStack.column()` and `SharedStack.column()` for the type of the result.
+        ## Parameters
+        ### _name:_
+        The name of the attribute.
+        ### _count:_
+        The number of latest states to include. Defaults to all of them.
+        """
+        if not isinstance(self.undo_stack, (ColumnarStack, SharedStack)):
+            raise TypeError(f'`history()` needs the COLUMNAR or SHARED style; this Client uses the {self.style} style.')
+        return self.undo_stack.column(name, count)
+
+    def close(self) -> None:
+        """
+        Releases any resources held by the stacks of this Client. Useful only when using `SHARED` style, where it
+        destroys the shared memory block holding the undo stack; the process which created the Client is responsible
+        for calling it once readers are done. Otherwise, the block is destroyed when the stack is garbage-collected
+        or the process exits.
+        """
+        for stack in (self.undo_stack, self.redo_stack):
+            if isinstance(stack, SharedStack):
+                stack.close()
 
     def entrust(self, key, manager) -> None:
         """
@@ -114,17 +219,41 @@ class UndaClient:
         """
         manager[key] = self
 
+    def mark_dirty(self) -> None:
+        """
+        Notifies every `UndaManager` this Client is entrusted to that the target object has changed since the last
+        update, so that it gets visited by the next `update_all()` of a change-tracking manager.
+        `UndaObject` instances call this automatically whenever one of their attributes is set.
+        """
+        for manager in _MANAGERS.get(self, ()):
+            manager._mark_dirty(self)
+
+    def _mark_updated(self) -> None:
+        for manager in _MANAGERS.get(self, ()):
+            manager._mark_updated(self)
+
+    def _mark_stocked(self) -> None:
+        for manager in _MANAGERS.get(self, ()):
+            manager._mark_stocked(self)
+
+    def _mark_cleared(self) -> None:
+        if len(self.undo_stack) == 0 and len(self.redo_stack) == 0:
+            for manager in _MANAGERS.get(self, ()):
+                manager._mark_cleared(self)
+
     def clear_undo_stack(self) -> None:
         """
         Clears the undo stack for this object.
         """
         self.undo_stack.clear()
+        self._mark_cleared()
 
     def clear_redo_stack(self) -> None:
         """
         Clears the redo stack for this object.
         """
         self.redo_stack.clear()
+        self._mark_cleared()
 
     def clear_stacks(self) -> None:
         """
@@ -173,7 +302,7 @@ class UndaClient:
         By default, the "relevant stack" is the undo stack.
         """
         if self.style == DEEPCOPY:
-            self.undo_stack.append(deepcopy(self.target))
+            self.undo_stack.append(self._snapshot())
             self.clear_redo_stack()
 
         if self.style == LOGGER:
@@ -187,6 +316,16 @@ class UndaClient:
             self.clear_redo_stack()
             del checklist_anomalies
 
+        if self.style == SLOTS:
+            self._push_field_changes(self.undo_stack)
+            self.clear_redo_stack()
+
+        if self.style in (COLUMNAR, SHARED):
+            self.undo_stack.append(self._read_state())
+            self.clear_redo_stack()
+
+        self._mark_updated()
+
     def undo(self, depth: int = 0, quiet: bool = False, inplace: bool = False) -> Optional[object]:
         """
         Saves current state to the redo stack, then returns a version of the target object with the latest state data
@@ -198,14 +337,20 @@ class UndaClient:
         Specifies if Unda should be quiet if undo is called but there's nothing to revert to. If False, an error will
         be returned if that happens.
         ### _inplace:_
-        Useful only if the target object has a `__dict__` attribute.
-        If set to True, the `__dict__` of the target will be replaced by the `__dict__` value of the result of the undo
-        operation and returns False, thus there would be no need to re-assign the target object's variable to the
+        Useful only if the target object is mutable.
+        If set to True, the attributes of the target will be replaced by those of the result of the undo
+        operation and returns None, thus there would be no need to re-assign the target object's variable to the
         result (which is what should be done if this parameter is False).
         """
         if not quiet and len(self.undo_stack) == 0:
             raise IndexError('There\'s nothing left to undo.')
 
+        # The current state only goes to the other stack, so the Client stays dirty if it was; restoring a state
+        # in place makes it dirty.
+        self._mark_stocked()
+        if inplace:
+            self.mark_dirty()
+
         if self.style == DEEPCOPY:
             # Clear all states above the required one.
             self.undo_stack = deque(list(self.undo_stack)[0:len(
@@ -213,9 +358,12 @@ class UndaClient:
             # Get the required state
             result = self.undo_stack.pop()
             # Save the state before the undo call to the redo stack.
-            self.redo_stack.append(deepcopy(self.target))
+            self.redo_stack.append(self._snapshot())
             if inplace:
-                self.target.__dict__.update(result.__dict__)
+                if hasattr(result, '__dict__'):
+                    self.target.__dict__.update(result.__dict__)
+                else:
+                    write_fields(self.target, read_fields(result, get_fields(type(result))))
                 return None
             return result
 
@@ -236,6 +384,27 @@ class UndaClient:
             result.__dict__.update(_result)
             return result
 
+        if self.style == SLOTS:
+            # Get the required state, then clear it and all states above it.
+            state = self.compile_stack(depth=len(self.undo_stack) - depth)
+            self.undo_stack = deque(list(self.undo_stack)[0:len(self.undo_stack) - depth - 1],
+                                    maxlen=self.stack_height)
+            # Save the changes needed to get back to the state before the undo call to the redo stack.
+            self.redo_stack.append(extract_field_changes(state, self.target, self._fields))
+            return self._restore_fields(state, inplace)
+
+        if self.style in (COLUMNAR, SHARED):
+            if len(self.undo_stack) == 0:
+                return None
+            # Clear all states above the required one.
+            for _ in range(min(depth, len(self.undo_stack) - 1)):
+                self.undo_stack.pop()
+            # Get the required state
+            state = self.undo_stack.pop()
+            # Save the state before the undo call to the redo stack.
+            self.redo_stack.append(self._read_state())
+            return self._restore_fields(state, inplace)
+
     def redo(self, depth: int = 0, quiet: bool = False, inplace: bool = False) -> Optional[object]:
         """
         Saves current state to the redo stack, then returns a version of the target object with the latest state data
@@ -247,14 +416,20 @@ class UndaClient:
         Specifies if Unda should be quiet if redo is called but there's nothing to revert to. If False, an error will
         be returned if that happens.
         ### _inplace:_
-        Useful only if the target object has a `__dict__` attribute.
-        If set to True, the `__dict__` of the target will be replaced by the `__dict__` value of the result of the redo
-        operation and returns False, thus there would be no need to re-assign the target object's variable to the
+        Useful only if the target object is mutable.
+        If set to True, the attributes of the target will be replaced by those of the result of the redo
+        operation and returns None, thus there would be no need to re-assign the target object's variable to the
         result (which is what should be done if this parameter is False).
         """
         if not quiet and len(self.redo_stack) == 0:
             raise IndexError('There\'s nothing left to redo.')
 
+        # The current state only goes to the other stack, so the Client stays dirty if it was; restoring a state
+        # in place makes it dirty.
+        self._mark_stocked()
+        if inplace:
+            self.mark_dirty()
+
         if self.style == DEEPCOPY:
             # Clear all states above the required one.
             self.redo_stack = deque(list(self.redo_stack)[0:len(
@@ -262,9 +437,12 @@ class UndaClient:
             # Get the required state
             result = self.redo_stack.pop()
             # Save the state before the redo call to the undo stack.
-            self.undo_stack.append(deepcopy(self.target))
+            self.undo_stack.append(self._snapshot())
             if inplace:
-                self.target.__dict__.update(result.__dict__)
+                if hasattr(result, '__dict__'):
+                    self.target.__dict__.update(result.__dict__)
+                else:
+                    write_fields(self.target, read_fields(result, get_fields(type(result))))
                 return None
             return result
 
@@ -283,3 +461,28 @@ class UndaClient:
             result = copy(self.target)
             result.__dict__.update(_result)
             return result
+
+        if self.style == SLOTS:
+            # Get the required state, then clear it and all states above it.
+            changes = list(self.redo_stack)[len(self.redo_stack) - depth - 1:]
+            self.redo_stack = deque(list(self.redo_stack)[0:len(self.redo_stack) - depth - 1],
+                                    maxlen=self.stack_height)
+            # Save the state before the redo call to the undo stack.
+            self._push_field_changes(self.undo_stack)
+            state = read_fields(self.target, self._fields)
+            for change in reversed(changes):
+                if change is not None:
+                    state.update(change)
+            return self._restore_fields(state, inplace)
+
+        if self.style in (COLUMNAR, SHARED):
+            if len(self.redo_stack) == 0:
+                return None
+            # Clear all states above the required one.
+            for _ in range(min(depth, len(self.redo_stack) - 1)):
+                self.redo_stack.pop()
+            # Get the required state
+            state = self.redo_stack.pop()
+            # Save the state before the redo call to the undo stack.
+            self.undo_stack.append(self._read_state())
+            return self._restore_fields(state, inplace)
@@ -1,16 +1,59 @@
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Set
+from weakref import WeakSet
 
 from .constants import STACK_HEIGHT
 from .functions import _deprecated
-from .unda_client import UndaClient
+from .unda_client import UndaClient, _MANAGERS
+from .unda_object import UndaObject
 
 
 class _ObjectDict(dict):
+    # Every write goes through __setitem__ and __delitem__, so that the manager's indexes stay in sync even with direct
+    # edits.
+    def __init__(self, manager: 'UndaManager'):
+        super().__init__()
+        self._manager = manager
+
     def __setitem__(self, _key: Any, _value: Any):
-        if isinstance(_value, UndaClient):
-            super().__setitem__(_key, _value)
-        else:
-            super().__setitem__(_key, UndaClient(_value))
+        if isinstance(_value, UndaObject):
+            _value = _value.client
+        elif not isinstance(_value, UndaClient):
+            _value = UndaClient(_value)
+        if _key in self:
+            del self[_key]
+        super().__setitem__(_key, _value)
+        self._manager._register(_key, _value)
+
+    def __delitem__(self, _key: Any):
+        client = super().pop(_key)
+        self._manager._unregister(_key, client)
+
+    def pop(self, _key: Any, *default):
+        if _key not in self:
+            if default:
+                return default[0]
+            raise KeyError(_key)
+        client = super().__getitem__(_key)
+        del self[_key]
+        return client
+
+    def popitem(self):
+        key, client = super().popitem()
+        self._manager._unregister(key, client)
+        return key, client
+
+    def setdefault(self, _key: Any, _default: Any = None):
+        if _key not in self:
+            self[_key] = _default
+        return super().__getitem__(_key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        for key in list(self.keys()):
+            del self[key]
 
 class UndaManager:
     """
@@ -19,7 +62,7 @@ class UndaManager:
     
     When an object is added to an UndaManager, if it isn't an `UndaClient`, a new `UndaClient` is made for the
     object automatically and is added to the UndaManager in its stead. If it's already an `UndaClient`, it
-    gets added directly.
+    gets added directly, and if it's an `UndaObject`, its own `client` is added.
     
     _Essentially, the `UndaManager` only manages `UndaClient`s, not the objects themselves._
     
@@ -56,22 +99,55 @@ class UndaManager:
     ### _stack_height:_
     An integer representing the maximum number of states to store in any stack created by this `UndaManager`. 
 
+    ### _track_changes:_
+    If set to True, `update_all()` only visits Clients which have been marked dirty since their last update, and the
+    `clear_*_stacks()` methods only visit Clients which have something in their stacks. Newly added Clients start
+    dirty. `UndaObject` instances mark their Clients dirty automatically whenever an attribute is set; for other
+    targets, call `mark_dirty()` (or `UndaClient.mark_dirty()`) after changing them.
+    Defaults to False, in which case every Client is visited.
+
     """
     starter_objects: Optional[Dict] = None
 
     def __init__(
             self,
             starter_objects: Optional[Dict] = None,
-            stack_height: int = STACK_HEIGHT
+            stack_height: int = STACK_HEIGHT,
+            track_changes: bool = False
     ) -> None:
 
         self.stack_height: int = stack_height
         self.starter_objects: Optional[Dict] = starter_objects
-        self.objects: _ObjectDict = _ObjectDict()
+        self.track_changes: bool = track_changes
+        self.objects: _ObjectDict = _ObjectDict(self)
+        # Clients changed since their last update, and Clients with non-empty stacks.
+        self._dirty: Set[UndaClient] = set()
+        self._stocked: Set[UndaClient] = set()
+        # Reverse index of the keys each Client is stored under.
+        self._keys: Dict[UndaClient, Set] = {}
 
         if self.starter_objects:
             self.add_objects(self.starter_objects)
 
+    def __getstate__(self):
+        # The objects are stored as a plain dict; the indexes are rebuilt from it in __setstate__().
+        state = self.__dict__.copy()
+        state['objects'] = dict(self.objects)
+        del state['_keys']
+        return state
+
+    def __setstate__(self, state):
+        objects = state.pop('objects')
+        dirty, stocked = state.pop('_dirty'), state.pop('_stocked')
+        self.__dict__.update(state)
+        self.objects = _ObjectDict(self)
+        self._dirty = set()
+        self._stocked = set()
+        self._keys = {}
+        self.objects.update(objects)
+        self._dirty = dirty
+        self._stocked = stocked
+
     def __getitem__(self, key):
         return self.objects.get(key)
 
@@ -81,6 +157,37 @@ class UndaManager:
     def __delitem__(self, key):
         del self.objects[key]
 
+    def _register(self, key, client: UndaClient) -> None:
+        if client not in self._keys:
+            self._keys[client] = set()
+            _MANAGERS.setdefault(client, WeakSet()).add(self)
+            self._dirty.add(client)
+            if len(client.undo_stack) > 0 or len(client.redo_stack) > 0:
+                self._stocked.add(client)
+        self._keys[client].add(key)
+
+    def _unregister(self, key, client: UndaClient) -> None:
+        keys = self._keys[client]
+        keys.discard(key)
+        if not keys:
+            del self._keys[client]
+            _MANAGERS[client].discard(self)
+            self._dirty.discard(client)
+            self._stocked.discard(client)
+
+    def _mark_dirty(self, client: UndaClient) -> None:
+        self._dirty.add(client)
+
+    def _mark_updated(self, client: UndaClient) -> None:
+        self._dirty.discard(client)
+        self._stocked.add(client)
+
+    def _mark_stocked(self, client: UndaClient) -> None:
+        self._stocked.add(client)
+
+    def _mark_cleared(self, client: UndaClient) -> None:
+        self._stocked.discard(client)
+
     def add_object(self, key: str, target: object) -> None:
         """
         Entrusts an object into the UndaManager's care.
@@ -121,6 +228,18 @@ class UndaManager:
         """
         self[key] = client
 
+    def mark_dirty(self, key) -> None:
+        """
+        Marks the UndaClient referenced by the specified key as changed, so that the next `update_all()` visits it
+        when `track_changes` is enabled.
+
+        ## Parameters
+
+        ### _key_:
+        The string used to reference a specific `UndaClient`.
+        """
+        self._dirty.add(self.objects[key])
+
     def update(self, key):
         """
         Updates the UndaClient referenced by the specified key.
@@ -136,7 +255,12 @@ class UndaManager:
     def update_all(self) -> None:
         """
         Same as "update", but applies it to all keys.
+        If `track_changes` is enabled, only Clients marked dirty since their last update are visited.
         """
+        if self.track_changes:
+            for client in list(self._dirty):
+                client.update()
+            return
         for key in self.objects.keys():
             self.objects[key].update()
 
@@ -144,6 +268,10 @@ class UndaManager:
         """
         Calls the "clear_stacks" function for all objects.
         """
+        if self.track_changes:
+            for client in list(self._stocked):
+                client.clear_stacks()
+            return
         for key in self.objects.keys():
             self.objects[key].clear_stacks()
 
@@ -151,6 +279,10 @@ class UndaManager:
         """
         Calls the "clear_undo_stack" function for all objects.
         """
+        if self.track_changes:
+            for client in list(self._stocked):
+                client.clear_undo_stack()
+            return
         for key in self.objects.keys():
             self.objects[key].clear_undo_stack()
 
@@ -158,6 +290,10 @@ class UndaManager:
         """
         Calls the "clear_redo_stack" function for all objects.
         """
+        if self.track_changes:
+            for client in list(self._stocked):
+                client.clear_redo_stack()
+            return
         for key in self.objects.keys():
             self.objects[key].clear_redo_stack()
 
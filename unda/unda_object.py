@@ -20,6 +20,8 @@ class UndaObject:
 
     That's it. Any method which step 3 affected can be undone by calling `self.undo()`.
 
+    Setting an attribute marks the object's Client dirty for any change-tracking `UndaManager` it's entrusted to.
+
 
     ## Dealing with Multiple Inheritance and `__init__()` functions.
 
@@ -38,6 +40,12 @@ class UndaObject:
     def __init__(self, style: Optional[str] = None, stack_height: Optional[int] = None):
         self.client = UndaClient(self, style=style, stack_height=stack_height)
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        client = self.__dict__.get('client')
+        if client is not None:
+            client.mark_dirty()
+
     def update(self):
         """
         Same as `UndaClient.update()`.
@@ -4,7 +4,12 @@ from typing import Optional
 class Version:
     """
     Basic class built for versioning and version comparisons.
+
+    Versions are immutable and hashable. They are ordered by their `(major, minor, patch)` tuple;
+    `additional_info` is descriptive only and doesn't take part in comparisons.
     """
+    __slots__ = ('major', 'minor', 'patch', 'additional_info', '_key')
+
     def __init__(
         self,
         major: int,
@@ -13,14 +18,33 @@ class Version:
         additional_info: Optional[str] = None
         ):
         if type(major) == str:
-            self.__dict__.update(self.parse(major).__dict__)
-        else:
-            self.set_values(major, minor, patch, additional_info)
+            parsed = self.parse(major)
+            major, minor, patch, additional_info = parsed.major, parsed.minor, parsed.patch, parsed.additional_info
+        object.__setattr__(self, 'major', major)
+        object.__setattr__(self, 'minor', minor)
+        object.__setattr__(self, 'patch', patch)
+        object.__setattr__(self, 'additional_info', additional_info)
+        object.__setattr__(self, '_key', (major, minor, patch))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Version objects are immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Version objects are immutable.')
+
+    def __reduce__(self):
+        return Version, (self.major, self.minor, self.patch, self.additional_info)
 
     def __str__(self):
         return f"{self.major}.{self.minor}.{self.patch}"\
                f"{f' ({self.additional_info})' if self.additional_info else ''}"
 
+    def __repr__(self):
+        return f"Version({self.major}, {self.minor}, {self.patch}, {self.additional_info!r})"
+
+    def __hash__(self):
+        return hash(self._key)
+
     @staticmethod
     def parse(version_string: str):
         """
@@ -31,84 +55,75 @@ class Version:
 
         major = ''.join([char for char in beginning[::-1] if char.isnumeric()][::-1])
         patch = []
-                       
+
         for index, char in enumerate(end):
             if char.isalpha():
                 additional_info = end[index:]
                 break
             patch.append(char)
         patch = ''.join(patch)
-        
+
         major = int(major) if major != '' else 0
         minor = int(minor)
         patch = int(patch) if patch != '' else 0
         return Version(major, minor, patch, additional_info)
 
-    def set_values(
-        self,
-        major: int,
-        minor: int = 0,
-        patch: int = 0,
-        additional_info: Optional[str] = None
-        ):
-        self.major = major
-        self.minor = minor
-        self.patch = patch
-        self.additional_info = additional_info
-        
+    def shifted(self, major: int = 0, minor: int = 0, patch: int = 0):
+        """
+        Returns a new Version with the values of its parts increased or decreased
+        by the specified values, e.g. `version.shifted(minor=3)`.
+        """
+        return Version(self.major + major, self.minor + minor, self.patch + patch, self.additional_info)
+
+    def _immutable(self, name: str, use_instead: str):
+        raise TypeError(f'`Version.{name}()` is deprecated; Version objects are immutable and can no longer be '
+                        f'changed in place. Use `{use_instead}` instead.')
+
+    def set_values(self, *args, **kwargs):
+        """
+        DEPRECATED: Version objects are immutable. Raises a TypeError; create a new `Version` instead.
+        """
+        self._immutable('set_values', 'Version(major, minor, patch, additional_info)')
+
     def shift_major(self, value=1):
         """
-        Increases or decreases the value of the major part of the version
-        by the specified value.
+        DEPRECATED: Version objects are immutable. Raises a TypeError; use `shifted(major=value)` instead.
         """
-        self.major += value
+        self._immutable('shift_major', 'version.shifted(major=value)')
 
     def shift_minor(self, value=1):
         """
-        Increases or decreases the value of the minor part of the version
-        by the specified value.
+        DEPRECATED: Version objects are immutable. Raises a TypeError; use `shifted(minor=value)` instead.
         """
-        self.minor += value
+        self._immutable('shift_minor', 'version.shifted(minor=value)')
 
     def shift_patch(self, value=1):
         """
-        Increases or decreases the value of the patch part of the version
-        by the specified value.
+        DEPRECATED: Version objects are immutable. Raises a TypeError; use `shifted(patch=value)` instead.
         """
-        self.patch += value
-
-    def _comparator_function(self, comparator: str, other):
-        if type(self) != type(other):
-            message = f"Invalid type (`{str(type(self))}`) for comparison with a Version."
-            raise TypeError(message)
-        
-        major_fill = max(len(str(self.major)), len(str(other.major)))
-        major, major_ = str(self.major).zfill(major_fill), str(other.major).zfill(major_fill)
-
-        minor_fill = max(len(str(self.minor)), len(str(other.minor)))
-        minor, minor_ = str(self.minor).zfill(minor_fill), str(other.minor).zfill(minor_fill)
-        
-        patch_fill = max(len(str(self.patch)), len(str(other.patch)))
-        patch, patch_ = str(self.patch).zfill(patch_fill), str(other.patch).zfill(patch_fill)
-
-        a = int(major+minor+patch)
-        b = int(major_+minor_+patch_)
-
-        return eval(f'a {comparator} b')
+        self._immutable('shift_patch', 'version.shifted(patch=value)')
 
     def __lt__(self, other):
-        return self._comparator_function('<', other)
+        if type(other) is not Version:
+            return NotImplemented
+        return self._key < other._key
 
     def __le__(self, other):
-        return self._comparator_function('<=', other)
+        if type(other) is not Version:
+            return NotImplemented
+        return self._key <= other._key
 
     def __eq__(self, other):
-        return self._comparator_function('==', other)
+        if type(other) is not Version:
+            return NotImplemented
+        return self._key == other._key
 
     def __gt__(self, other):
-        return self._comparator_function('>', other)
+        if type(other) is not Version:
+            return NotImplemented
+        return self._key > other._key
 
     def __ge__(self, other):
-        return self._comparator_function('>=', other)
-
-    
+        if type(other) is not Version:
+            return NotImplemented
+        return self._key >= other._key